@@ -7,14 +7,168 @@ import bloxorzutils
 from aima.search import Problem
 
 
+def _pack(x, y, o):
+    """
+    Pack the position and the orientation of the block into a single int state. Ints are hashed
+    and compared much faster than tuples, which matters since states are used as dict keys on
+    every node expansion. Each coordinate takes 8 bits, so maps are limited to 255 tiles per axis.
+    A packed state hashes to itself, so it is already a collision-free key for the transposition
+    table and Zobrist-style random keys are not needed.
+    :return: Packed state
+    """
+    return x | (y << 8) | (o << 16)
+
+
+def _unpack(state):
+    """
+    Inverse of _pack.
+    :return: x, y, o of the packed state
+    """
+    return state & 0xFF, (state >> 8) & 0xFF, state >> 16
+
+
+def _index(W, state):
+    """
+    Index of the position of the packed state in the maps laid out as the bordered flat map,
+    see BloxorzGame.init_map.
+    :param W: row stride of the bordered flat map.
+    :param state: packed state
+    :return: Flat index
+    """
+    return (((state >> 8) & 0xFF) + 1) * W + (state & 0xFF) + 1
+
+
+def _goal_distances(goal, W, size):
+    """
+    Manhattan distance from every tile to the closest goal, laid out as the bordered flat map.
+    Two passes propagate the distances from the tiles above and to the left, then from the tiles
+    below and to the right, which gives the exact distances in O(size) for any number of goals.
+    :param goal: goal descriptors in the form ((x, y), orientation)
+    :param W: row stride of the bordered flat map.
+    :param size: length of the bordered flat map.
+    :return: List of distances, all zero if there is no goal.
+    """
+    if not goal:
+        return [0] * size
+
+    dist = [size] * size  # Larger than any distance in the map
+    for (gx, gy), _ in goal:
+        dist[(gy + 1) * W + gx + 1] = 0
+    for i in range(size):
+        if i >= W and dist[i - W] + 1 < dist[i]:
+            dist[i] = dist[i - W] + 1
+        if i % W and dist[i - 1] + 1 < dist[i]:
+            dist[i] = dist[i - 1] + 1
+    for i in range(size - 1, -1, -1):
+        if i + W < size and dist[i + W] + 1 < dist[i]:
+            dist[i] = dist[i + W] + 1
+        if (i + 1) % W and dist[i + 1] + 1 < dist[i]:
+            dist[i] = dist[i + 1] + 1
+    return dist
+
+
+def _validate(safe, W, state):
+    """
+    Check if the block is completely on non-empty tiles of the map.
+    :param safe: validity masks of the anchor positions per orientation, see BloxorzGame.init_map.
+    :param W: row stride of the masks.
+    :param state: packed state to be validated.
+    :return: True if state is valid, False otherwise.
+    """
+    # Masks are laid out as the bordered flat map, so the position is shifted by the border.
+    return bool(safe[state >> 16][(((state >> 8) & 0xFF) + 1) * W + (state & 0xFF) + 1])
+
+
+# Displacement tables of the moves indexed by [orientation][d + 2], None where the move is not
+# possible. The block can only pitch in the direction of its orientation when horizontal or in any
+# direction when vertical. Due to the definition of position of state, the block moves 2 tiles
+# along positive direction and 1 tile along negative direction when it is horizontal. However, for
+# the vertical case, it is vice-versa. Also pitching changes the orientation: (dx, dy, new o).
+_PITCH_DELTA = (
+    None,
+    (None, (-1, 0, 3), None, (2, 0, 3), None),
+    ((0, -1, 3), None, None, None, (0, 2, 3)),
+    ((0, -2, 2), (-2, 0, 1), None, (1, 0, 1), (0, 1, 2)),
+)
+# The block cannot roll in the direction of its orientation when horizontal and in any direction
+# when vertical. Rolling moves the block one tile and keeps the orientation: (dx, dy).
+_ROLL_DELTA = (
+    None,
+    ((0, -1), None, None, None, (0, 1)),
+    (None, (-1, 0), None, (1, 0), None),
+    (None, None, None, None, None),
+)
+
+
+def _pitch(safe, W, state, d):
+    """
+    Pitch the block in the given direction. Pitch is only possible in the direction along
+    the long edge if it is horizontal or in any direction when it is vertical. Both the
+    position and orientation of the block changes as a result of this action.
+    :param safe: validity masks, see _validate.
+    :param W: row stride of the masks.
+    :param state: packed state of the block before the action.
+    :param d: intended direction of motion
+    :return: Resulting packed state if pitching is possible; -1 otherwise
+    """
+    delta = _PITCH_DELTA[state >> 16][d + 2]
+    if delta is None:
+        return -1
+    x = (state & 0xFF) + delta[0]
+    y = ((state >> 8) & 0xFF) + delta[1]
+
+    # The block cannot move out of the map or into an empty tile, even partially.
+    if x < 0 or y < 0:
+        return -1
+    state = x | (y << 8) | (delta[2] << 16)
+    return state if _validate(safe, W, state) else -1
+
+
+def _roll(safe, W, state, d):
+    """
+    Roll the block in the given direction. Roll is only possible in the direction along the
+    short edge since the block flips over its long edge. Position of the block is updated
+    but the orientation does not change as a result of this action.
+    :param safe: validity masks, see _validate.
+    :param W: row stride of the masks.
+    :param state: packed state of the block before the action.
+    :param d: intended direction of motion
+    :return: Resulting packed state if rolling is possible; -1 otherwise
+    """
+    o = state >> 16
+    delta = _ROLL_DELTA[o][d + 2]
+    if delta is None:
+        return -1
+    x = (state & 0xFF) + delta[0]
+    y = ((state >> 8) & 0xFF) + delta[1]
+
+    # The block cannot move out of the map or into an empty tile, even partially.
+    if x < 0 or y < 0:
+        return -1
+    state = x | (y << 8) | (o << 16)
+    return state if _validate(safe, W, state) else -1
+
+
 class BloxorzGame(Problem):
     """
     Implements the game as AI Problem and defines the game rules, internal representations and
     interfaces for further usage of the class.
     """
 
+    # Solving is bound by the interpreter dispatch on millions of small attribute accesses, not by
+    # data movement since the whole map fits in L1. Slots turn those attribute accesses into fixed
+    # offsets rather than instance dict lookups. Problem has no slots, so the instance still has a
+    # __dict__ which stays unused.
+    __slots__ = ('_rows', '_cols', '_safe', '_W', '_succ', '_tt', '_decoder', '_dist',
+                 '_goal_positions', 'initial', 'goal')
+
     _BLOCK_VAL = 2
     _GOAL_VAL = -1
+    _SEPARATORS = ('col_sep', 'row_sep')
+
+    # Opcodes of the game actions. An action is a tuple of (opcode, direction).
+    PITCH = 0
+    ROLL = 1
 
     @staticmethod
     def decoder_gen(empty='X', safe='O', block='S', goal='G',
@@ -54,23 +208,21 @@ class BloxorzGame(Problem):
         filtered_map = str_map.replace(decoder['col_sep'], '') \
             .split(decoder['row_sep'])
         # For rectangular map, number of tile in each row should be equal.
-        for i in range(1, len(filtered_map)):
-            if len(filtered_map[0]) != len(filtered_map[i]):
-                return False  # Even one inequality is enough to be invalid.
+        if len({len(row) for row in filtered_map}) != 1:
+            return False
 
         # CHECK NUMBER OF BLOCK TILES:
-        if not 0 < str_map.count(
-                list(decoder.keys())[list(decoder.values()).index(
-                    BloxorzGame._BLOCK_VAL)]) < 3:
+        # Several characters may decode into the block tile, so all of them are counted.
+        num_block_tiles = sum(str_map.count(key) for key, value in decoder.items()
+                              if value == BloxorzGame._BLOCK_VAL and key not in BloxorzGame._SEPARATORS)
+        if not 0 < num_block_tiles < 3:
             return False
 
         # CHECK INVALID CHARACTERS:
-        for key in decoder:
-            # Remove all valid characters to see if any invalid character exists in the map
-            str_map = str_map.replace(
-                key if 'col_sep' != key != 'row_sep' else decoder[key],
-                '')
-        return not bool(len(str_map))  # Non-zero length indicate there exist at least one invalid char
+        # Single pass over the rows whose separators are already removed; any character other
+        # than the tiles is invalid. Several characters may decode into the same tile.
+        valid = {key for key in decoder if key not in BloxorzGame._SEPARATORS}
+        return all(char in valid for row in filtered_map for char in row)
 
     def __init__(self, game_map=None, decoder=None):
         """
@@ -83,44 +235,123 @@ class BloxorzGame(Problem):
         :param game_map: rectangular, str map corresponding to the encoding generated by BloxorzGame.get_decoder.
         :param decoder: generated by BloxorzGame.get_decoder.
         """
-        self._map = None
+        self._rows = 0
+        self._cols = 0
+        self._safe = None
+        self._W = 0
+        # The successor table is read-only, so a BFS layer could be expanded in parallel. It is not:
+        # under the GIL threads never overlap the pure-Python expansion, and a process pool would
+        # pickle every layer both ways for what is one dict lookup per state.
+        self._succ = {}
+        self._dist = []
+        self._goal_positions = frozenset()
+        # Transposition table of solve_id: packed state -> (searched depth, best action)
+        self._tt = {}
         self._decoder = decoder if decoder else BloxorzGame.decoder_gen()
-        self._state = None
 
         # Default initial and goal states to initialize the Problem class.
         problem_parameters = (None, None)
         if game_map:
-            # Find Problem parameters and _map. Validity of the map will be checked in init_map.
+            # Find Problem parameters and the map tables. Validity of the map will be checked in init_map.
             problem_parameters = self.init_map(game_map, self._decoder)
 
         Problem.__init__(self, *problem_parameters)
-        self._state = self.initial
 
-    def _in_map(self, x, y):
+    def _build_successors(self):
+        """
+        Since the map is static, the successors of every valid state are computed once and the
+        search only looks them up. Successors closer to a goal come first.
+        :return: Dict mapping each valid packed state to a tuple of (action, next packed state)
+        """
+        safe, W, dist = self._safe, self._W, self._dist
+        succ = {}
+        args = (1, 2, -2, -1)
+        rows, cols = self._rows, self._cols
+        for y in range(rows):
+            for x in range(cols):
+                for o in (1, 2, 3):
+                    state = _pack(x, y, o)
+                    if not _validate(safe, W, state):
+                        continue
+                    transitions = [((BloxorzGame.PITCH, d), _pitch(safe, W, state, d)) for d in args] + \
+                                  [((BloxorzGame.ROLL, d), _roll(safe, W, state, d)) for d in args]
+                    succ[state] = tuple(sorted((t for t in transitions if t[1] != -1),
+                                               key=lambda t: dist[_index(W, t[1])]))
+        return succ
+
+    def _dfs(self, state, depth):
+        """
+        Depth-limited DFS used by solve_id. Failed searches are stored in the transposition table
+        so that a state is not searched again for the same or a smaller depth. The successor
+        that got closest to a goal is tried first in the next iteration. The search keeps its own
+        stack of frames instead of recursing, so the length of a solution is not bounded by the
+        recursion limit.
+        :param state: packed state to be searched from.
+        :param depth: remaining number of moves.
+        :return: List of actions reaching a goal, None if there is none within depth moves.
+        """
+        goals, succ, tt, dist, W = self._goal_positions, self._succ, self._tt, self._dist, self._W
+
+        # Frames of the states being expanded: [state, depth, transition iterator, closest goal
+        # distance in the subtree, best action]. path holds the actions from the root to the state
+        # that is entered.
+        stack = []
+        path = []
+        while True:
+            if state in goals:
+                return path
+
+            closest = dist[_index(W, state)]
+            entry = tt.get(state)
+            if depth and not (entry and entry[0] >= depth):
+                transitions = succ[state]
+                if entry:
+                    # Move ordering: the best action of the previous iteration goes first.
+                    transitions = sorted(transitions, key=lambda t: t[0] != entry[1])
+                stack.append([state, depth, iter(transitions), closest, entry[1] if entry else None])
+            elif not stack:
+                return None
+            else:
+                # Leaf of the search: report its distance to the parent.
+                action = path.pop()
+                if closest < stack[-1][3]:
+                    stack[-1][3], stack[-1][4] = closest, action
+
+            # Enter the next successor of the top frame, finishing the exhausted frames.
+            while True:
+                frame = stack[-1]
+                transition = next(frame[2], None)
+                if transition is not None:
+                    action, state = transition
+                    depth = frame[1] - 1
+                    path.append(action)
+                    break
+
+                # No goal is reachable within depth moves. An entry stored by a revisit of this
+                # state deeper in the same search cannot be searched deeper than this one.
+                stack.pop()
+                tt[frame[0]] = (frame[1], frame[4])
+                if not stack:
+                    return None
+                action = path.pop()
+                if frame[3] < stack[-1][3]:
+                    stack[-1][3], stack[-1][4] = frame[3], action
+
+    def _goal_distance(self, state):
         """
-        Check if the given indices corresponds to somewhere in map
-        :return: True if in the map, False otherwise
+        Manhattan distance from the position of the block to the closest goal.
+        :param state: packed state
+        :return: Distance in tiles
         """
-        return y < len(self._map) and x < len(self._map[0])
+        return self._dist[_index(self._W, state)]
 
     def actions(self, state):
         """
         Given any possible state, returns applicable action-argument list.
         :param state: Possible state in the map.
-        :return: List of tuples in the form [(act1, arg11, arg12, ...), (act2, arg21, ...), ...]
+        :return: List of tuples in the form [(opcode1, d1), (opcode2, d2), ...]
         """
-        # Game actions utilizes class variables, so set the required variables first.
-        backup_state = self._state
-        self._state = state
-
-        # Actions of the game and their possible directions +-x and +-y.
-        actions = (self.pitch_block, self.roll_block)
-        args = (1, 2, -2, -1)
-        act_arg = [(action, arg) for action in actions for arg in args
-                   if action(arg, apply_action=False)]
-
-        self._state = backup_state  # Restore the state for convenience
-        return act_arg
+        return [t[0] for t in self._succ[state]]
 
     def goal_test(self, state):
         """
@@ -128,10 +359,16 @@ class BloxorzGame(Problem):
         :param state: to be tested.
         :return: True if goal is reached, False otherwise.
         """
-        for goal in self.goal:
-            if goal[0] == state[0]:
-                return goal[1] == state[1]
-        return False
+        return state in self._goal_positions
+
+    def h(self, node):
+        """
+        Heuristic for informed searches such as A* or IDA*. Any move displaces the block by at
+        most 2 tiles, so half of the distance to the closest goal never overestimates the cost.
+        :param node: search node whose state is to be evaluated.
+        :return: Lower bound of the number of moves to reach a goal.
+        """
+        return (self._goal_distance(node.state) + 1) // 2
 
     def init_map(self, str_map, decoder=None):
         """
@@ -152,79 +389,69 @@ class BloxorzGame(Problem):
         filtered_map = str_map.replace(self._decoder['col_sep'], '') \
             .split(self._decoder['row_sep'])
 
-        # Decode all characters in each row of the map, form a decoded list of rows where each
-        # row is a list of adjacent tiles.
-        self._map = [[self._decoder[char] for char in line] for line in filtered_map]
-
-        initial = [None, None]
+        # Decode all characters of the map into contiguous bytes, one byte per tile, row by row.
+        rows, cols = len(filtered_map), len(filtered_map[0])
+        if rows > 255 or cols > 255:
+            raise ValueError('Str map cannot have more than 255 tiles along an axis!')
+        # Translate all tiles at once at C level instead of a dict lookup per character.
+        table = str.maketrans({char: chr(v & 0xFF) for char, v in self._decoder.items()
+                               if char not in BloxorzGame._SEPARATORS})
+        raw = ''.join(filtered_map).translate(table).encode('latin-1')
+        self._rows, self._cols = rows, cols
+
+        # Flatten the map into contiguous bytes surrounded by a border of empty tiles, so that any
+        # move out of the map lands on an empty tile and no bounds check is needed. Tile values
+        # are stored as unsigned bytes.
+        W = cols + 2
+        self._W = W
+        flat = bytes(W) + b''.join(b'\0' + raw[j * cols:(j + 1) * cols] + b'\0' for j in range(rows)) + bytes(W)
+
+        # Precompute whether the block can stand at each anchor position for each orientation, so
+        # a state is validated by a single lookup. The masks are computed for the whole map at
+        # once as big ints, one byte per tile: shifting down by 1 byte aligns each tile with its
+        # right neighbour and by W bytes with the tile below. Index 0 is unused.
+        size = len(flat)
+        tiles = int.from_bytes(flat.translate(bytes([0]) + bytes([1]) * 255), 'little')
+        self._safe = (None,
+                      (tiles & (tiles >> 8)).to_bytes(size, 'little'),
+                      (tiles & (tiles >> (8 * W))).to_bytes(size, 'little'),
+                      tiles.to_bytes(size, 'little'))
+
+        # Find the block and goal tiles in one pass over the flat map. Positions are converted
+        # back from bordered flat indices to map coordinates.
+        blocks = []
         goal = []
-        for j in range(len(self._map)):
-            # Check goal tile in j'th row.
-            i = 0
-            for k in range(self._map[j].count(BloxorzGame._GOAL_VAL)):
-                # To find multiple goals in the same row, trim the search area from the previous goal.
-                i = self._map[j].index(BloxorzGame._GOAL_VAL, i + 1)
-                goal.append(((i, j), 3))
-
-            # Check block tile(s)
-            num_block_tiles = self._map[j].count(BloxorzGame._BLOCK_VAL)
-            if num_block_tiles == 2:
-                # The block is in x-direction
-                initial = [(self._map[j].index(BloxorzGame._BLOCK_VAL), j), 1]
-            elif not initial[0] and num_block_tiles == 1:
-                i = self._map[j].index(BloxorzGame._BLOCK_VAL)
-                # If initial[0] is None, this is the first time block-tile was encountered. For
-                # the first occurrence, it is the position of the upper portion if aligned with
-                # y-axis or of left portion if aligned with x-axis or the position of the block
-                # if aligned with z-axis. Either way it is the position of the block.
-                initial[0] = (i, j)
-                # If there is a block tile below, it is aligned with y-axis, otherwise with z-axis.
-                if self._map[i][j + 1] == BloxorzGame._BLOCK_VAL:
-                    initial[1] = 2
-                else:
-                    initial[1] = 3
-
-        # Convert to tuples since they won't change anymore.
-        return tuple(initial), tuple(goal)
-
-    def pitch_block(self, d, apply_action=True):
-        """
-        Pitch the block in the given direction. Pitch is only possible in the direction along
-        the long edge if it is horizontal or in any direction when it is vertical. Both the
-        position and orientation of the block changes as a result of this action. If pitching
-        is not possible,  the action is simply not applied.
-        :param d: intended direction of motion
-        :param apply_action: Execute the action if True, otherwise check applicability.
-        :return: True if motion is applied or can be applied; False otherwise
-        """
-        # The block can only pitch in the direction of its orientation when horizontal
-        # or in any direction when vertical.
-        if self._state[1] == abs(d) or self._state[1] == 3:
-            # Deep copy for pseudo-pitch
-            state = [list(self._state[0]), self._state[1]]
-
-            # Due to the definition of position of state, the block moves 2 tiles along positive
-            # direction and 1 tile along negative direction when it is horizontal. However, for
-            # the vertical case, it is vice-versa. Also pitching changes the orientation.
-            if state[1] == 3:
-                displacement = -2 if d < 0 else 1
-                state[1] = abs(d)
-            else:
-                displacement = -1 if d < 0 else 2
-                state[1] = 3
-
-            state[0][abs(d) - 1] += displacement
-
-            # Check if the block is in the safe tile for the pseudo-rolling. If the player wants
-            # to move into an empty tile, it should be possible. However for the pseudo-pitching
-            # case, the purpose is to determine whether it is possible to move or not.
-            if not apply_action:
-                return self.validate_state(state)
-
-            # If not pseudo, apply the action:
-            self._state = (tuple(state[0]), state[1])
-            return True
-        return False
+        for idx, v in enumerate(flat):
+            if v == BloxorzGame._BLOCK_VAL:
+                blocks.append(idx)
+            elif v == BloxorzGame._GOAL_VAL & 0xFF:
+                y, x = divmod(idx, W)
+                goal.append(((x - 1, y - 1), 3))
+
+        # The first block tile is the position of the left portion if aligned with x-axis, of the
+        # upper portion if aligned with y-axis or of the block if aligned with z-axis. The second
+        # tile, if any, is either next to it or below it.
+        y, x = divmod(blocks[0], W)
+        if len(blocks) == 1:
+            orientation = 3
+        elif blocks[1] - blocks[0] == 1:
+            orientation = 1
+        elif blocks[1] - blocks[0] == W:
+            orientation = 2
+        else:
+            raise ValueError('Block tiles in the str map are not adjacent!')
+        initial = ((x - 1, y - 1), orientation)
+
+        # Successors are sorted by their distance to the goals, so moves towards a goal are tried first.
+        self._dist = _goal_distances(goal, W, size)
+        self._succ = self._build_successors()
+
+        # The block can only finish standing vertically on a goal tile, so goal test is a single
+        # set membership of the packed state.
+        self._goal_positions = frozenset(_pack(gx, gy, 3) for ((gx, gy), o) in goal if o == 3)
+
+        # Goals are kept as (position, orientation) descriptors, the initial state is packed.
+        return _pack(initial[0][0], initial[0][1], initial[1]), tuple(goal)
 
     def result(self, state, action):
         """
@@ -233,70 +460,82 @@ class BloxorzGame(Problem):
         :param action: to be applied
         :return: Result of the applied action
         """
-        # Game actions utilizes class variables, so set the required variables first.
-        backup_state = self._state
-        self._state = state
-
-        # Knowing the signature of the functions, apply the action.
-        action[0](*action[1:])
-        # The result is written on the class variable self._state.
-        state = self._state
+        for act, next_state in self._succ[state]:
+            if act == action:
+                return next_state
+        return None
 
-        self._state = backup_state
-        return state
-
-    def roll_block(self, d, apply_action=True):
+    def solve_bfs(self):
+        """
+        Solve the game by breadth-first search running entirely on the successor table, without
+        the per-node overhead of the aima Node objects.
+        :return: List of actions reaching a goal, None if no goal is reachable.
         """
-        Roll the block in the given direction. Roll is only possible in the direction along the
-        short edge since the block flips over its long edge. Position of the block is updated
-        but the orientation does not change as a result of this action. If rolling is not
-        possible, the action is simply not applied.
-        :param d: intended direction of motion
-        :param apply_action: Execute the action if True, otherwise check applicability.
-        :return: True if motion is applied or can be applied; False otherwise
+        succ = self._succ
+        goals = self._goal_positions
+        if self.initial in goals:
+            return []
+
+        # The queue doubles as the search tree: each entry keeps the index of its parent entry and
+        # the action leading to it, so the path is rebuilt without a parent dict.
+        states = [self.initial]
+        parents = [-1]
+        actions = [None]
+
+        # Visited states are kept in a bitset with one bit per position and orientation, indexed
+        # densely as (y * cols + x) * 4 + o.
+        cols = self._cols
+        visited = bytearray((self._rows * cols * 4 + 7) >> 3)
+        bit = (((self.initial >> 8) & 0xFF) * cols + (self.initial & 0xFF)) * 4 + (self.initial >> 16)
+        visited[bit >> 3] |= 1 << (bit & 7)
+        head = 0
+        while head < len(states):
+            for action, next_state in succ[states[head]]:
+                bit = (((next_state >> 8) & 0xFF) * cols + (next_state & 0xFF)) * 4 + (next_state >> 16)
+                if visited[bit >> 3] & (1 << (bit & 7)):
+                    continue
+                visited[bit >> 3] |= 1 << (bit & 7)
+                states.append(next_state)
+                parents.append(head)
+                actions.append(action)
+                if next_state in goals:
+                    path = []
+                    i = len(states) - 1
+                    while i:
+                        path.append(actions[i])
+                        i = parents[i]
+                    path.reverse()
+                    return path
+            head += 1
+        return None
+
+    def solve_id(self, max_depth):
         """
-        # The block cannot roll in the direction of its orientation when horizontal and in any
-        # direction when vertical.
-        if self._state[1] != abs(d) and self._state[1] != 3:
-            # Deep copy for pseudo-roll
-            state = [list(self._state[0]), self._state[1]]
-            state[0][abs(d) - 1] += int(d / abs(d))
-
-            # Check if the block is in the safe tile for the pseudo-rolling. If the player wants
-            # to move into an empty tile, it should be possible. However for the pseudo-rolling
-            # case, the purpose is to determine whether it is possible to move or not.
-            if not apply_action:
-                return self.validate_state(state)
-
-            # If not pseudo, apply the action:
-            self._state = (tuple(state[0]), state[1])
-            return True
-        return False
+        Solve the game by iterative deepening DFS. The transposition table is retained between
+        the iterations, so transpositions are not searched again and the moves are reordered.
+        :param max_depth: maximum number of moves in the solution.
+        :return: List of actions reaching a goal, None if there is no solution within max_depth moves.
+        """
+        self._tt = {}
+        for depth in range(max_depth + 1):
+            path = self._dfs(self.initial, depth)
+            if path is not None:
+                return path
+        return None
 
     def validate_state(self, state):
         """
         Validate the state for the current map. If the block is completely in safe tile(s),
         then the state is valid.
-        :param state: to be validated
+        :param state: packed state to be validated
         :return: True if state is valid, False otherwise.
         """
-        # Regardless of the block orientation, check the position given by the state definition.
-        if not self._in_map(state[0][0], state[0][1]):
-            return False
-        if not self._map[state[0][1]][state[0][0]]:  # Indexing convention of the map is reverse due to init_map!
-            return False
-
-        # For vertical orientation of the block, validation is completed.
-        # Find the adjacent occupied tile from the direction give by the state. Having the position (x, y), we have
-        #   (x+1, y) for x-oriented block
-        #   (x, y+1) for y-oriented block
-        x_index = state[0][0] + 1 if state[1] == 1 else state[0][0]
-        y_index = state[0][1] + 1 if state[1] == 2 else state[0][1]
-        if not self._in_map(x_index, y_index):
-            return False
-        if not state[1] == 3 and not self._map[y_index][x_index]:
+        # The kernel relies on the border of the map, so states beyond it are rejected here.
+        x, y, o = _unpack(state)
+        rows, cols = self._rows, self._cols
+        if x >= cols or y >= rows or not 0 < o < 4:
             return False
-        return True
+        return _validate(self._safe, self._W, state)
 
     def value(self, state):
         """
@@ -0,0 +1,207 @@
+"""
+Author: Ugur Mengilli
+
+Randomized comparison of the solvers of BloxorzGame against a reference search written from the
+game rules, independent of the packed states and the precomputed tables.
+"""
+import random
+import unittest
+from collections import deque
+from types import SimpleNamespace
+
+from bloxorzgame import BloxorzGame, _pack
+
+
+def reference_moves(rows, state):
+    """
+    Successors of the state by the game rules, on a list of str rows of tile characters.
+    :param rows: map rows, one character per tile.
+    :param state: ((x, y), orientation)
+    :return: List of valid next states
+    """
+    def safe(x, y):
+        return 0 <= y < len(rows) and 0 <= x < len(rows[0]) and rows[y][x] != 'X'
+
+    (x, y), o = state
+    moves = []
+    for d in (1, 2, -2, -1):
+        dx, dy = (1, 0) if abs(d) == 1 else (0, 1)
+        step = 1 if d > 0 else -1
+        if o == 3:
+            # Pitch from vertical: 1 tile along positive direction, 2 tiles along negative one.
+            n = 1 if d > 0 else -2
+            moves.append(((x + n * dx, y + n * dy), abs(d)))
+        elif o == abs(d):
+            # Pitch from horizontal: 2 tiles along positive direction, 1 tile along negative one.
+            n = 2 if d > 0 else -1
+            moves.append(((x + n * dx, y + n * dy), 3))
+        else:
+            moves.append(((x + step * dx, y + step * dy), o))
+    return [((x, y), o) for (x, y), o in moves
+            if safe(x, y) and (o != 1 or safe(x + 1, y)) and (o != 2 or safe(x, y + 1))]
+
+
+def reference_distance(rows, initial, goals):
+    """
+    Number of moves of the shortest solution by plain BFS on the game rules.
+    :return: Number of moves, None if no goal is reachable
+    """
+    distance = {initial: 0}
+    queue = deque([initial])
+    while queue:
+        state = queue.popleft()
+        if state in goals:
+            return distance[state]
+        for next_state in reference_moves(rows, state):
+            if next_state not in distance:
+                distance[next_state] = distance[state] + 1
+                queue.append(next_state)
+    return None
+
+
+def random_map(rng):
+    """
+    Generate a random valid map with the default encoding and its reference parameters.
+    :return: str map, rows, initial state, set of goal states
+    """
+    height, width = rng.randint(1, 8), rng.randint(2, 8)
+    rows = [[rng.choice('OOOX') for _ in range(width)] for _ in range(height)]
+    x, y = rng.randrange(width), rng.randrange(height)
+    orientation = rng.choice([o for o in (1, 2, 3) if (o != 1 or x + 1 < width) and (o != 2 or y + 1 < height)])
+    rows[y][x] = 'S'
+    if orientation != 3:
+        rows[y + (orientation == 2)][x + (orientation == 1)] = 'S'
+    for _ in range(rng.randint(1, 3)):
+        gx, gy = rng.randrange(width), rng.randrange(height)
+        if rows[gy][gx] != 'S':
+            rows[gy][gx] = 'G'
+    goals = {((i, j), 3) for j, row in enumerate(rows) for i, tile in enumerate(row) if tile == 'G'}
+    return '\n'.join(' '.join(row) for row in rows), [''.join(row) for row in rows], ((x, y), orientation), goals
+
+
+def corridor_map(width, lanes):
+    """
+    Generate a serpentine corridor: full-width lanes joined by 2-tile links alternating between the
+    right and the left end. The block starts at the top-left corner and the goal is at the end.
+    :return: str map
+    """
+    rows = []
+    for k in range(lanes):
+        rows.append(['O'] * width)
+        if k < lanes - 1:
+            for _ in range(2):
+                link = ['X'] * width
+                link[width - 1 if k % 2 == 0 else 0] = 'O'
+                rows.append(link)
+    rows[0][0] = 'S'
+    rows[-1][width - 1 if lanes % 2 else 0] = 'G'
+    return '\n'.join(' '.join(row) for row in rows)
+
+
+class TestSolvers(unittest.TestCase):
+
+    def assert_solution(self, game, path, expected):
+        if expected is None:
+            self.assertIsNone(path)
+            return
+        self.assertEqual(len(path), expected)
+        state = game.initial
+        for action in path:
+            self.assertIn(action, game.actions(state))
+            state = game.result(state, action)
+        self.assertTrue(game.goal_test(state))
+
+    def test_random_maps(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            str_map, rows, initial, goals = random_map(rng)
+            game = BloxorzGame(str_map)
+            self.assertEqual(game.initial, _pack(initial[0][0], initial[0][1], initial[1]))
+            expected = reference_distance(rows, initial, goals)
+            self.assert_solution(game, game.solve_bfs(), expected)
+            self.assert_solution(game, game.solve_id(expected if expected is not None else 12), expected)
+
+    def test_heuristic_is_admissible(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            game = BloxorzGame(random_map(rng)[0])
+            path = game.solve_bfs()
+            if path is None:
+                continue
+            # Along the optimal path, h never exceeds the number of remaining moves.
+            state = game.initial
+            for remaining in range(len(path), 0, -1):
+                self.assertLessEqual(game.h(SimpleNamespace(state=state)), remaining)
+                state = game.result(state, path[len(path) - remaining])
+            self.assertEqual(game.h(SimpleNamespace(state=state)), 0)
+
+    def test_long_corridor(self):
+        # The solution is longer than the default recursion limit.
+        game = BloxorzGame(corridor_map(31, 50))
+        path = game.solve_bfs()
+        self.assertGreater(len(path), 1000)
+        self.assert_solution(game, game.solve_id(len(path)), len(path))
+
+
+class TestBloxorzGame(unittest.TestCase):
+
+    def test_init_map_after_construction(self):
+        game = BloxorzGame()
+        game.initial, game.goal = game.init_map('S O O\nO O G')
+        self.assertTrue(game.goal_test(_pack(2, 1, 3)))
+        game.initial, game.goal = game.init_map('G O S')
+        self.assertFalse(game.goal_test(_pack(2, 1, 3)))
+        self.assertTrue(game.goal_test(_pack(0, 0, 3)))
+
+    def test_init_map_size_limit(self):
+        row = ' '.join(['S'] + ['O'] * 253 + ['G'])
+        game = BloxorzGame(row)
+        self.assertEqual(game.goal, (((254, 0), 3),))
+        with self.assertRaises(ValueError):
+            BloxorzGame(row + ' O')
+        with self.assertRaises(ValueError):
+            BloxorzGame('\n'.join(['S'] + ['O'] * 254 + ['G']))
+
+    def test_init_map_non_adjacent_block_tiles(self):
+        with self.assertRaises(ValueError):
+            BloxorzGame('S O S\nO O G')
+        with self.assertRaises(ValueError):
+            BloxorzGame('S O\nO O\nS G')
+
+    def test_validate_map_multi_char_separator(self):
+        decoder = BloxorzGame.decoder_gen(col_sep=', ')
+        self.assertTrue(BloxorzGame.validate_map('S, O\nO, G', decoder))
+        self.assertFalse(BloxorzGame.validate_map('S,O\nO G', decoder))
+
+    def test_validate_map_aliased_tiles(self):
+        decoder = BloxorzGame.decoder_gen()
+        decoder['.'] = 1
+        self.assertTrue(BloxorzGame.validate_map('S O .\nO . G', decoder))
+        self.assertFalse(BloxorzGame.validate_map('S O ,\nO . G', decoder))
+
+    def test_init_map_aliased_tiles(self):
+        decoder = BloxorzGame.decoder_gen()
+        decoder['.'] = 1
+        decoder['#'] = 0
+        game = BloxorzGame('S O .\nO . G\n# X O', decoder)
+        self.assertTrue(game.validate_state(_pack(2, 0, 3)))
+        self.assertTrue(game.validate_state(_pack(1, 1, 1)))
+        self.assertFalse(game.validate_state(_pack(0, 2, 3)))
+        self.assertFalse(game.validate_state(_pack(1, 2, 3)))
+
+    def test_init_map_decoder_changed_in_place(self):
+        decoder = BloxorzGame.decoder_gen()
+        game = BloxorzGame('S O O G', decoder)
+        decoder['.'] = 1
+        game.initial, game.goal = game.init_map('S . . G', decoder)
+        self.assertEqual(game.solve_bfs(), [(BloxorzGame.PITCH, 1), (BloxorzGame.PITCH, 1)])
+
+    def test_validate_state_out_of_map(self):
+        game = BloxorzGame('S O O\nO O G')
+        self.assertFalse(game.validate_state(_pack(5, 5, 3)))
+        self.assertFalse(game.validate_state(_pack(2, 1, 1)))
+        self.assertTrue(game.validate_state(_pack(1, 1, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()